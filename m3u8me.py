@@ -2,35 +2,26 @@
 
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
+import contextlib
 
 import sys
 import os
 import json
 import re
-import queue
+import random
 import time
 import logging
 import tempfile
 import shutil
 import threading
 import concurrent.futures
+import functools
 import threading
 import subprocess
 import importlib.util
-import undetected_chromedriver as uc
+import struct
 from datetime import datetime
-from collections import deque
+from collections import Counter, deque, namedtuple
 from urllib.parse import urljoin, urlparse, quote, quote_plus, urlencode
 from pathlib import Path
 from queue import Queue
@@ -44,7 +35,22 @@ warnings.filterwarnings('ignore', category=urllib3.exceptions.InsecureRequestWar
 
 import requests
 import m3u8
-import psutil
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    # Not available on Windows; the stock event loop is used instead
+    uvloop = None
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QPushButton, QProgressBar, QFileDialog, QMessageBox, QTabWidget,
@@ -54,7 +60,6 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import (
     Qt, QThread, pyqtSignal, QSize, QTimer, QSettings
 )
-from PyQt5.QtNetwork import QLocalSocket, QLocalServer
 from PyQt5.QtGui import QPalette, QColor, QFont, QIcon, QPixmap
 
 # Set up logging
@@ -93,22 +98,317 @@ def get_base_url(url, parsed_url):
         return os.path.dirname(url) + '/'
     return parsed_url.scheme + '://' + parsed_url.netloc + os.path.dirname(parsed_url.path) + '/'
 
-class RateLimiter:
-    def __init__(self, max_per_second=2):
-        self.delay = 1.0 / max_per_second
-        self.last_call = 0
-        self.lock = threading.Lock()
+def run_coroutine(coro):
+    """Run coro on a fresh event loop, using uvloop when it is installed"""
+    if uvloop is not None and sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+def append_file(path, outfile):
+    """Copy the file at path onto the end of outfile, in the kernel on Linux"""
+    with open(path, 'rb') as infile:
+        if not sys.platform.startswith('linux'):
+            # macOS sendfile only targets sockets
+            shutil.copyfileobj(infile, outfile, length=4*1024*1024)
+            return
         
-    def wait(self):
-        with self.lock:
-            elapsed = time.time() - self.last_call
-            if elapsed < self.delay:
-                time.sleep(self.delay - elapsed)
-            self.last_call = time.time()
-
-rate_limiter = RateLimiter(max_per_second=2)
+        outfile.flush()
+        size = os.fstat(infile.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(outfile.fileno(), infile.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+class OrderedSegments:
+    """Hands downloaded segment files to a consumer strictly in playlist order"""
+    def __init__(self, total):
+        self.total = total
+        self.aborted = False
+        self._paths = {}
+        self._cond = threading.Condition()
+        
+    def put(self, index, path):
+        with self._cond:
+            self._paths[index] = path
+            self._cond.notify_all()
+            
+    def abort(self):
+        with self._cond:
+            self.aborted = True
+            self._cond.notify_all()
+            
+    def get(self, index):
+        """Block until segment index is available, or return None if aborted"""
+        with self._cond:
+            while index not in self._paths and not self.aborted:
+                self._cond.wait()
+            return None if self.aborted else self._paths[index]
+            
+    def __iter__(self):
+        for index in range(self.total):
+            path = self.get(index)
+            if path is None:
+                return
+            yield path
+
+# Codecs that can be stream-copied into each output container as-is
+COPY_COMPATIBLE_CODECS = {
+    'mp4': ({'h264', 'hevc'}, {'aac', 'mp3'}),
+    'mkv': ({'h264', 'hevc', 'mpeg2video'}, {'aac', 'mp3', 'ac3', 'eac3'}),
+    'ts': ({'h264', 'hevc', 'mpeg2video'}, {'aac', 'mp3', 'ac3', 'eac3'}),
+}
+
+# Largest span of adjacent EXT-X-BYTERANGE segments fetched in one request
+MAX_COALESCED_RANGE = 16 * 1024 * 1024
+
+# Hardware H.264 encoders in order of preference: the input options that keep
+# decoding on the same device, and the option taking a CRF-like quality value
+HARDWARE_ENCODERS = {
+    'h264_nvenc': (['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'], '-cq'),
+    'h264_qsv': (['-hwaccel', 'qsv', '-hwaccel_output_format', 'qsv'], '-global_quality'),
+    'h264_videotoolbox': (['-hwaccel', 'videotoolbox'], '-q:v'),
+}
+
+@functools.lru_cache(maxsize=None)
+def detect_hardware_encoder():
+    """Return the first hardware encoder FFmpeg can actually open, or None"""
+    for encoder in HARDWARE_ENCODERS:
+        # Being compiled in doesn't mean the device is there, so encode a frame
+        probe_cmd = [
+            'ffmpeg', '-hide_banner', '-v', 'error',
+            '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+            '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+        ]
+        try:
+            result = subprocess.run(probe_cmd, capture_output=True, timeout=15)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode == 0:
+            logger.info(f"Using hardware encoder {encoder}")
+            return encoder
+    return None
+
+def hardware_encoder_args(encoder, quality):
+    """Return the output options encoding video with encoder at the libx264 CRF for quality"""
+    crf = {'Super Duper!': 18, 'WTF!!?': 28}.get(quality, 23)
+    quality_option = HARDWARE_ENCODERS[encoder][1]
+    if encoder == 'h264_videotoolbox':
+        # VideoToolbox's scale runs 1-100 with higher being better
+        crf = 100 - 2 * crf
+    return ['-c:v', encoder, quality_option, str(crf)]
+
+# Lightweight stand-in for m3u8.Segment holding only what the downloader uses
+PlaylistSegment = namedtuple('PlaylistSegment', ['uri', 'duration', 'byterange'])
 
 class CustomStyle:
+    # Enhanced stylesheet with modern, clean design
+    STYLESHEET = """
+        QMainWindow {
+            background-color: #1c1c1c;
+        }
+        
+        /* Main container styling */
+        QWidget {
+            margin: 0;
+            padding: 0;
+        }
+        
+        /* Group box styling */
+        QGroupBox {
+            border: 1px solid #3d3d3d;
+            border-radius: 8px;
+            margin-top: 1.5em;
+            padding: 15px;
+            background-color: #2a2a2a;
+        }
+        
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 15px;
+            padding: 0 5px;
+            color: #ffffff;
+            font-weight: bold;
+        }
+        
+        /* Button styling */
+        QPushButton {
+            background-color: #2fd492;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-weight: bold;
+            min-width: 100px;
+            margin: 2px;
+        }
+        
+        QPushButton:hover {
+            background-color: #25a270;
+        }
+        
+        QPushButton:pressed {
+            background-color: #1c8159;
+        }
+        
+        QPushButton:disabled {
+            background-color: #383838;
+            color: #888888;
+        }
+        
+        /* Input field styling */
+        QLineEdit {
+            padding: 8px;
+            border-radius: 6px;
+            border: 1px solid #3d3d3d;
+            background-color: #333333;
+            color: white;
+            selection-background-color: #4285f4;
+            margin: 2px;
+        }
+        
+        QLineEdit:focus {
+            border: 1px solid #4285f4;
+        }
+        
+        /* Progress bar styling */
+        QProgressBar {
+            border: none;
+            border-radius: 4px;
+            background-color: #333333;
+            height: 20px;
+            text-align: center;
+            margin: 2px;
+        }
+        
+        QProgressBar::chunk {
+            border-radius: 4px;
+            background-color: #4285f4;
+        }
+        
+        /* Download rows; the chunk colour follows the bar's state property */
+        DownloadWidget QProgressBar::chunk {
+            background-color: #2979ff;
+            border-radius: 2px;
+        }
+        
+        DownloadWidget QProgressBar[state="red"]::chunk {
+            background-color: #ff5252;
+        }
+        
+        DownloadWidget QProgressBar[state="amber"]::chunk {
+            background-color: #ffd740;
+        }
+        
+        DownloadWidget QProgressBar[state="green"]::chunk {
+            background-color: #69f0ae;
+        }
+        
+        /* Tab widget styling */
+        QTabWidget::pane {
+            border: 1px solid #3d3d3d;
+            border-radius: 8px;
+            top: -1px;
+            background-color: #2a2a2a;
+        }
+        
+        QTabBar::tab {
+            background-color: #333333;
+            color: white;
+            padding: 10px 20px;
+            margin: 2px;
+            border-top-left-radius: 6px;
+            border-top-right-radius: 6px;
+        }
+        
+        QTabBar::tab:selected {
+            background-color: #4285f4;
+        }
+        
+        QTabBar::tab:hover:!selected {
+            background-color: #3d3d3d;
+        }
+        
+        /* Scroll area styling */
+        QScrollArea {
+            border: none;
+            background-color: transparent;
+        }
+        
+        QScrollBar:vertical {
+            border: none;
+            background-color: #2a2a2a;
+            width: 10px;
+            margin: 0;
+        }
+        
+        QScrollBar::handle:vertical {
+            background-color: #4d4d4d;
+            border-radius: 5px;
+            min-height: 20px;
+        }
+        
+        QScrollBar::handle:vertical:hover {
+            background-color: #5d5d5d;
+        }
+        
+        /* Status bar styling */
+        QStatusBar {
+            background-color: #252525;
+            color: white;
+            border-top: 1px solid #3d3d3d;
+        }
+        
+        QStatusBar QLabel {
+            padding: 3px 6px;
+        }
+        
+        /* Combobox styling */
+        QComboBox {
+            padding: 6px;
+            border-radius: 6px;
+            border: 1px solid #3d3d3d;
+            background-color: #333333;
+            color: white;
+            min-width: 100px;
+        }
+        
+        QComboBox::drop-down {
+            border: none;
+            width: 20px;
+        }
+        
+        QComboBox::down-arrow {
+            image: none;
+            border-left: 5px solid transparent;
+            border-right: 5px solid transparent;
+            border-top: 5px solid white;
+            margin-right: 5px;
+        }
+        
+        /* Download widget styling */
+        DownloadWidget {
+            background-color: #2d2d2d;
+            border-radius: 8px;
+            padding: 12px;
+            margin: 8px 4px;
+        }
+        
+        DownloadWidget QLabel {
+            color: white;
+            font-size: 13px;
+        }
+        
+        /* Logo container styling */
+        #logo_container {
+            margin: 20px;
+            padding: 10px;
+            background-color: transparent;
+        }
+    """
+
     @staticmethod
     def apply_dark_theme(app):
         app.setStyle(QStyleFactory.create("Fusion"))
@@ -131,192 +431,7 @@ class CustomStyle:
         
         app.setPalette(dark_palette)
         
-        # Enhanced stylesheet with modern, clean design
-        app.setStyleSheet("""
-            QMainWindow {
-                background-color: #1c1c1c;
-            }
-            
-            /* Main container styling */
-            QWidget {
-                margin: 0;
-                padding: 0;
-            }
-            
-            /* Group box styling */
-            QGroupBox {
-                border: 1px solid #3d3d3d;
-                border-radius: 8px;
-                margin-top: 1.5em;
-                padding: 15px;
-                background-color: #2a2a2a;
-            }
-            
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 5px;
-                color: #ffffff;
-                font-weight: bold;
-            }
-            
-            /* Button styling */
-            QPushButton {
-                background-color: #2fd492;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: bold;
-                min-width: 100px;
-                margin: 2px;
-            }
-            
-            QPushButton:hover {
-                background-color: #25a270;
-            }
-            
-            QPushButton:pressed {
-                background-color: #1c8159;
-            }
-            
-            QPushButton:disabled {
-                background-color: #383838;
-                color: #888888;
-            }
-            
-            /* Input field styling */
-            QLineEdit {
-                padding: 8px;
-                border-radius: 6px;
-                border: 1px solid #3d3d3d;
-                background-color: #333333;
-                color: white;
-                selection-background-color: #4285f4;
-                margin: 2px;
-            }
-            
-            QLineEdit:focus {
-                border: 1px solid #4285f4;
-            }
-            
-            /* Progress bar styling */
-            QProgressBar {
-                border: none;
-                border-radius: 4px;
-                background-color: #333333;
-                height: 20px;
-                text-align: center;
-                margin: 2px;
-            }
-            
-            QProgressBar::chunk {
-                border-radius: 4px;
-                background-color: #4285f4;
-            }
-            
-            /* Tab widget styling */
-            QTabWidget::pane {
-                border: 1px solid #3d3d3d;
-                border-radius: 8px;
-                top: -1px;
-                background-color: #2a2a2a;
-            }
-            
-            QTabBar::tab {
-                background-color: #333333;
-                color: white;
-                padding: 10px 20px;
-                margin: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-            }
-            
-            QTabBar::tab:selected {
-                background-color: #4285f4;
-            }
-            
-            QTabBar::tab:hover:!selected {
-                background-color: #3d3d3d;
-            }
-            
-            /* Scroll area styling */
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            
-            QScrollBar:vertical {
-                border: none;
-                background-color: #2a2a2a;
-                width: 10px;
-                margin: 0;
-            }
-            
-            QScrollBar::handle:vertical {
-                background-color: #4d4d4d;
-                border-radius: 5px;
-                min-height: 20px;
-            }
-            
-            QScrollBar::handle:vertical:hover {
-                background-color: #5d5d5d;
-            }
-            
-            /* Status bar styling */
-            QStatusBar {
-                background-color: #252525;
-                color: white;
-                border-top: 1px solid #3d3d3d;
-            }
-            
-            QStatusBar QLabel {
-                padding: 3px 6px;
-            }
-            
-            /* Combobox styling */
-            QComboBox {
-                padding: 6px;
-                border-radius: 6px;
-                border: 1px solid #3d3d3d;
-                background-color: #333333;
-                color: white;
-                min-width: 100px;
-            }
-            
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid white;
-                margin-right: 5px;
-            }
-            
-            /* Download widget styling */
-            DownloadWidget {
-                background-color: #2d2d2d;
-                border-radius: 8px;
-                padding: 12px;
-                margin: 8px 4px;
-            }
-            
-            DownloadWidget QLabel {
-                color: white;
-                font-size: 13px;
-            }
-            
-            /* Logo container styling */
-            #logo_container {
-                margin: 20px;
-                padding: 10px;
-                background-color: transparent;
-            }
-        """)
+        app.setStyleSheet(CustomStyle.STYLESHEET)
 
 
 class SystemTrayApp(QSystemTrayIcon):
@@ -460,26 +575,42 @@ MimeType=application/x-mpegURL;x-scheme-handler/m3u8me;
             return False
 
 class DownloadWidget(QFrame):
+    FRAME_STYLESHEET = """
+        QFrame {
+            background-color: #424242;
+            border-radius: 5px;
+            padding: 10px;
+            margin: 5px;
+        }
+        QLabel {
+            color: white;
+        }
+    """
+    
+    # Set on the bar itself, since the frame's QFrame rule would win over
+    # the application stylesheet; the chunk colours live there
+    PROGRESS_STYLESHEET = """
+        QProgressBar {
+            border: 1px solid #666666;
+            border-radius: 3px;
+            text-align: center;
+            height: 20px;
+            background-color: #353535;
+        }
+    """
+
     def __init__(self, url, parent=None):
         super().__init__(parent)
         self.url = url
+        self.status_color = "#2979ff"
+        self.progress_state = None
         self.init_ui()
         
     def init_ui(self):
         layout = QHBoxLayout(self)
         self.setFrameStyle(QFrame.Box | QFrame.Raised)
         
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #424242;
-                border-radius: 5px;
-                padding: 10px;
-                margin: 5px;
-            }
-            QLabel {
-                color: white;
-            }
-        """)
+        self.setStyleSheet(self.FRAME_STYLESHEET)
         
         # URL and status layout
         info_layout = QVBoxLayout()
@@ -498,19 +629,7 @@ class DownloadWidget(QFrame):
         self.progress_bar = QProgressBar()
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setAlignment(Qt.AlignCenter)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #666666;
-                border-radius: 3px;
-                text-align: center;
-                height: 20px;
-                background-color: #353535;
-            }
-            QProgressBar::chunk {
-                background-color: #2979ff;
-                border-radius: 2px;
-            }
-        """)
+        self.progress_bar.setStyleSheet(self.PROGRESS_STYLESHEET)
         
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.setFixedWidth(80)
@@ -522,7 +641,20 @@ class DownloadWidget(QFrame):
 
     def update_status(self, status, color="#2979ff"):
         self.status_label.setText(status)
-        self.status_label.setStyleSheet(f"color: {color};")
+        # Restyling re-polishes the widget, so skip it when nothing changes
+        if color != self.status_color:
+            self.status_color = color
+            self.status_label.setStyleSheet(f"color: {color};")
+
+    def set_progress_state(self, state):
+        # The colours are in the application stylesheet, keyed on this
+        # property, so a change only needs the bar re-polished
+        if state == self.progress_state:
+            return
+        self.progress_state = state
+        self.progress_bar.setProperty('state', state)
+        self.progress_bar.style().unpolish(self.progress_bar)
+        self.progress_bar.style().polish(self.progress_bar)
 
 class StreamDownloader(QThread):
     progress_updated = pyqtSignal(str, int, str)
@@ -535,9 +667,17 @@ class StreamDownloader(QThread):
         self.save_path = save_path
         self.settings = settings
         self.is_running = True
+        self.downloading = False
         self.temp_dir = None
         self.retry_count = settings.get('retry_attempts', 3)
         self.max_concurrent_segments = settings.get('max_workers', 30)
+        self.chunk_size = 1024 * 1024
+        
+        # Fallback hosts for relative segment URIs, resolved once up front
+        scheme = urlparse(self.url).scheme
+        self.segment_domain_bases = [
+            f"{scheme}://{domain}/" for domain in ('noltrixfire91.live', 'velloxfire.pro')
+        ]
         self.session = self._configure_session()
         
         self.headers = {
@@ -556,26 +696,45 @@ class StreamDownloader(QThread):
             'Cache-Control': 'no-cache'
         }
         
+    def stop(self):
+        self.is_running = False
+        
     @staticmethod
     def get_unique_filename(base_path, extension):
         """
         Generate a unique filename by appending a number if the file already exists.
         
+        The number comes from a single scan of the directory rather than one
+        existence check per taken name, and the file is created exclusively so
+        concurrent downloads into the same folder can't pick the same name.
+        
         Args:
             base_path (str): The base path and filename without extension
             extension (str): The file extension (e.g., 'mp4', 'mkv')
             
         Returns:
-            str: A unique filepath that doesn't exist
+            str: A unique filepath, created empty
         """
-        counter = 1
-        output_file = f"{base_path}.{extension}"
+        directory, name = os.path.split(base_path)
+        pattern = re.compile(rf"{re.escape(name)}_(\d+)\.{re.escape(extension)}")
+        counter = None
         
-        while os.path.exists(output_file):
-            output_file = f"{base_path}_{counter}.{extension}"
-            counter += 1
+        while True:
+            if counter is None:
+                output_file = f"{base_path}.{extension}"
+            else:
+                output_file = f"{base_path}_{counter}.{extension}"
+            try:
+                os.close(os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+                return output_file
+            except FileExistsError:
+                pass
             
-        return output_file
+            if counter is None:
+                taken = (pattern.fullmatch(entry) for entry in os.listdir(directory or '.'))
+                counter = max((int(m.group(1)) for m in taken if m), default=0) + 1
+            else:
+                counter += 1
 
     def _configure_session(self):
         session = requests.Session()
@@ -595,54 +754,116 @@ class StreamDownloader(QThread):
             'Cache-Control': 'no-cache'
         })
         
+        retries = urllib3.util.Retry(
+            total=self.retry_count,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True
+        )
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=self.max_concurrent_segments,
             pool_maxsize=self.max_concurrent_segments,
-            max_retries=self.retry_count,
+            max_retries=retries,
             pool_block=False
         )
         session.mount('http://', adapter)
         session.mount('https://', adapter)
         return session
     
+    def _configure_async_session(self, max_connections):
+        """Create the async HTTP client used for segment downloads"""
+        # TS segments are already compressed, so ask for them as-is and
+        # skip decompression
+        headers = dict(self.session.headers)
+        headers['Accept-Encoding'] = 'identity'
+        
+        # HTTP/2 multiplexes every segment over one TLS connection per host;
+        # servers without it are negotiated down to HTTP/1.1 via ALPN
+        if self.settings.get('use_http2', False) and httpx and importlib.util.find_spec('h2'):
+            # Connection-specific headers are not allowed in HTTP/2
+            headers.pop('Connection', None)
+            return httpx.AsyncClient(
+                http2=True,
+                verify=False,
+                headers=headers,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                follow_redirects=True
+            )
+        
+        connector = aiohttp.TCPConnector(
+            limit=max_connections,
+            limit_per_host=max_connections,
+            ttl_dns_cache=300,
+            ssl=False
+        )
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+        
+        # A larger read buffer keeps big segments from stalling on the
+        # default 64KB stream buffer
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=timeout,
+            read_bufsize=4 * self.chunk_size,
+            auto_decompress=False
+        )
+    
     def _try_domains(self, url):
-        """Try multiple domains for the same URL pattern"""
+        """Try multiple domains for the same URL pattern, racing them"""
         domains = ['droxonwave.site', 'noltrixfire91.live', 'velloxfire.pro']
         parsed = urlparse(url)
         path = parsed.path
         
-        for domain in domains:
-            try:
-                domain_url = f'https://{domain}{path}'
-                headers = {
-                    **self.session.headers,
-                    'Origin': f'https://{domain}',
-                    'Referer': f'https://{domain}/',
-                    'Host': domain,
-                    'X-Requested-With': 'XMLHttpRequest'
-                }
-                
-                logger.debug(f"Trying domain: {domain_url}")
-                logger.debug(f"Using headers: {headers}")
-                
-                response = self.session.get(
-                    domain_url,
-                    headers=headers,
-                    verify=False,
-                    timeout=30,
-                    allow_redirects=True
-                )
-                
-                if response.status_code == 200:
-                    logger.debug(f"Success with domain: {domain}")
+        # The first domain to answer wins, so a dead mirror costs at most one
+        # timeout rather than one per domain tried before the working one
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(domains))
+        try:
+            futures = [executor.submit(self._fetch_from_domain, domain, path) for domain in domains]
+            for future in concurrent.futures.as_completed(futures):
+                response = future.result()
+                if response is not None:
                     return response
-                    
-            except Exception as e:
-                logger.debug(f"Failed with domain {domain}: {str(e)}")
-                continue
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
                 
         raise Exception("All domains failed")
     
+    def _fetch_from_domain(self, domain, path):
+        """Fetch path from one domain, returning the response or None"""
+        try:
+            domain_url = f'https://{domain}{path}'
+            headers = {
+                **self.session.headers,
+                'Origin': f'https://{domain}',
+                'Referer': f'https://{domain}/',
+                'Host': domain,
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+            
+            logger.debug(f"Trying domain: {domain_url}")
+            logger.debug(f"Using headers: {headers}")
+            
+            response = self.session.get(
+                domain_url,
+                headers=headers,
+                verify=False,
+                timeout=30,
+                allow_redirects=True
+            )
+            
+            if response.status_code == 200:
+                logger.debug(f"Success with domain: {domain}")
+                return response
+                
+        except Exception as e:
+            logger.debug(f"Failed with domain {domain}: {str(e)}")
+        return None
+    
     def _get_domain_specific_headers(self, url):
         """Get domain-specific headers based on the URL"""
         parsed_url = urlparse(url)
@@ -660,55 +881,88 @@ class StreamDownloader(QThread):
         
         return headers
     
-    def _clean_url(self, url):
-        """Clean URL preserving special characters exactly as they appear"""
-        url = url.strip().rstrip(':')
-        # Keep the URL exactly as is, just clean up any trailing characters
-        return url
-
-    def _get_stream_url(self, playlist, base_url):
-        """Extract and process stream URL based on quality settings"""
-        available_streams = []
-        
-        for p in playlist.playlists:
-            bandwidth = getattr(p.stream_info, 'bandwidth', 0)
-            resolution = getattr(p.stream_info, 'resolution', None)
+    @staticmethod
+    def _fast_parse_playlist(content):
+        """
+        Parse a media playlist in a single pass over its lines.
+        
+        Only the tags the downloader relies on are recognised, dispatched by
+        prefix. As with m3u8.loads, a URI line only counts as a segment after
+        an #EXTINF tag. Master playlists return None so the caller can fall
+        back to m3u8.loads for their attribute lists.
+        
+        Args:
+            content (str): The playlist text
+            
+        Returns:
+            list: PlaylistSegment entries in playlist order, or None
+        """
+        segments = []
+        in_segment = False
+        duration = None
+        byterange = None
+        range_ends = {}
+        
+        for line in content.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            
+            if line.startswith('#'):
+                if line.startswith('#EXTINF:'):
+                    in_segment = True
+                    try:
+                        duration = float(line[8:].split(',', 1)[0])
+                    except ValueError:
+                        duration = None
+                elif line.startswith('#EXT-X-BYTERANGE:'):
+                    length, _, offset = line[17:].partition('@')
+                    byterange = (int(length), int(offset) if offset else None)
+                elif line.startswith('#EXT-X-STREAM-INF'):
+                    return None
+                continue
             
-            if resolution:
-                width, height = resolution
-                available_streams.append({
-                    'uri': self._clean_url(p.uri),
-                    'resolution': f"{width}x{height}",
-                    'height': height,
-                    'bandwidth': bandwidth
-                })
-            elif bandwidth:
-                available_streams.append({
-                    'uri': self._clean_url(p.uri),
-                    'resolution': f"Bandwidth: {bandwidth//1000}kbps",
-                    'height': 0,
-                    'bandwidth': bandwidth
-                })
-
-        if not available_streams:
+            if not in_segment:
+                continue
+            
+            if byterange:
+                # A sub-range without an offset continues where the previous
+                # sub-range of the same resource ended
+                length, offset = byterange
+                if offset is None:
+                    offset = range_ends.get(line, 0)
+                byterange = (length, offset)
+                range_ends[line] = offset + length
+            
+            segments.append(PlaylistSegment(line, duration, byterange))
+            in_segment = False
+            duration = None
+            byterange = None
+            
+        return segments
+    
+    def _get_stream_url(self, playlist):
+        """Pick the variant URI matching the quality setting"""
+        variants = [p for p in playlist.playlists if getattr(p.stream_info, 'resolution', None)]
+
+        if not variants:
             raise Exception("No valid streams found in playlist")
 
-        # Sort streams by quality
-        available_streams.sort(key=lambda x: (x['height'], x['bandwidth']), reverse=True)
+        # Rank by height and bandwidth
+        def rank(p):
+            return (p.stream_info.resolution[1], p.stream_info.bandwidth or 0)
 
-        # Select stream based on quality setting
+        # Only the middle pick needs the variants in order
         quality = self.settings.get('quality', 'Super Duper!')
         if quality == 'Super Duper!':
-            selected_stream = next(
-                (s for s in available_streams if s['height'] == 1080), 
-                available_streams[0]
-            )
+            full_hd = [p for p in variants if p.stream_info.resolution[1] == 1080]
+            selected_stream = max(full_hd or variants, key=rank)
         elif quality == 'WTF!!?':
-            selected_stream = available_streams[-1]
+            selected_stream = min(variants, key=rank)
         else:  # Ehh...
-            selected_stream = available_streams[len(available_streams)//2]
+            selected_stream = sorted(variants, key=rank, reverse=True)[len(variants)//2]
 
-        return selected_stream['uri']
+        return selected_stream.uri
     
     def run(self):
         try:
@@ -718,7 +972,6 @@ class StreamDownloader(QThread):
     
             # Handle direct M3U8 content
             if content.startswith('#EXTM3U'):
-                playlist = m3u8.loads(content)
                 # Get the first URL from the playlist
                 for line in content.split('\n'):
                     if line.startswith('http'):
@@ -727,172 +980,107 @@ class StreamDownloader(QThread):
             else:
                 base_url = content
     
+            playlist_url = base_url
+    
             # Try to fetch with multiple domains
             try:
                 response = self._try_domains(base_url)
-                playlist = m3u8.loads(response.text)
+                segments = self._fast_parse_playlist(response.text)
             except Exception as e:
                 raise Exception(f"Failed to fetch M3U8: {str(e)}")
     
             # Handle multi-quality streams
-            if not playlist.segments and playlist.playlists:
-                available_streams = []
-                for p in playlist.playlists:
-                    bandwidth = getattr(p.stream_info, 'bandwidth', 0)
-                    resolution = getattr(p.stream_info, 'resolution', None)
-                    if resolution:
-                        width, height = resolution
-                        available_streams.append({
-                            'uri': p.uri,
-                            'resolution': f"{width}x{height}",
-                            'height': height,
-                            'bandwidth': bandwidth
-                        })
-    
-                if not available_streams:
-                    raise Exception("No valid streams found in playlist")
-    
-                # Sort by height and bandwidth
-                available_streams.sort(key=lambda x: (x['height'], x['bandwidth']), reverse=True)
-    
-                # Select quality based on settings
-                quality = self.settings.get('quality', 'Super Duper!')
-                selected_stream = None
-                if quality == 'Super Duper!':
-                    selected_stream = next(
-                        (s for s in available_streams if s['height'] == 1080), 
-                        available_streams[0]
-                    )
-                elif quality == 'WTF!!?':
-                    selected_stream = available_streams[-1]
-                else:
-                    selected_stream = available_streams[len(available_streams)//2]
-    
-                selected_url = selected_stream['uri']
-                if not selected_url.startswith('http'):
-                    parsed_base = urlparse(base_url)
-                    base_path = '/'.join(parsed_base.path.split('/')[:-1])
-                    selected_url = f"https://{parsed_base.netloc}{base_path}/{selected_url}"
+            if segments is None:
+                playlist = m3u8.loads(response.text)
+                selected_url = urljoin(base_url, self._get_stream_url(playlist))
+                playlist_url = selected_url
     
                 # Try to fetch selected quality stream with domain fallback
                 try:
                     response = self._try_domains(selected_url)
-                    playlist = m3u8.loads(response.text)
+                    segments = self._fast_parse_playlist(response.text)
                 except Exception as e:
                     raise Exception(f"Failed to fetch quality stream: {str(e)}")
     
-                if not playlist.segments:
+                if not segments:
                     raise Exception("No segments found in the playlist")
     
-            # Prepare segment download queue and tracking
-            segment_queue = queue.Queue()
-            results = {}
-            failed_segments = set()
-            download_errors = []
-            completed_segments = 0
-            
-            # Thread-safe counter using Lock
-            counter_lock = threading.Lock()
-            
-            def increment_counter():
-                nonlocal completed_segments
-                with counter_lock:
-                    completed_segments += 1
-                    return completed_segments
-    
-            # Populate queue
-            for i, segment in enumerate(playlist.segments):
-                segment_url = segment.uri
-                if not segment_url.startswith('http'):
-                    if base_url:
-                        base_path = '/'.join(base_url.split('/')[:-1])
-                        segment_url = f"{base_path}/{segment_url}"
+            # Resolve segment URLs against the media playlist and pick their
+            # temp file locations. Byte-range segments that continue the
+            # previous one in the same file are merged into a single ranged
+            # request. Without a playlist URL, relative URIs are left for the
+            # download to try against each segment domain
+            base_dir = urljoin(playlist_url, '.') if playlist_url else None
+            segment_prefix = os.path.join(self.temp_dir, "segment_")
+            items = []
+            for segment in segments:
+                uri = segment.uri
+                if not playlist_url:
+                    segment_url = uri
+                elif uri[:1] not in ('', '/', '.', '?', '#') and ':' not in uri and '/.' not in uri:
+                    # Plain relative paths, by far the usual case, only
+                    # need the playlist's directory in front
+                    segment_url = base_dir + uri
+                else:
+                    segment_url = urljoin(playlist_url, uri)
+                
+                byte_range = None
+                if segment.byterange:
+                    length, offset = segment.byterange
+                    byte_range = (offset, offset + length - 1)
+                    if items:
+                        _, prev_url, prev_path, prev_range = items[-1]
+                        if (prev_range and prev_url == segment_url
+                                and prev_range[1] + 1 == offset
+                                and byte_range[1] - prev_range[0] < MAX_COALESCED_RANGE):
+                            items[-1] = (len(items) - 1, prev_url, prev_path, (prev_range[0], byte_range[1]))
+                            continue
                     
-                output_path = os.path.join(self.temp_dir, f"segment_{i:05d}.ts")
-                segment_queue.put((i, segment_url, output_path))
-                results[i] = None
+                i = len(items)
+                output_path = f"{segment_prefix}{i:05d}.ts"
+                items.append((i, segment_url, output_path, byte_range))
     
-            total_segments = len(playlist.segments)
-            max_workers = min(self.max_concurrent_segments, total_segments)
-            active_workers = threading.Event()
-            active_workers.set()
+            if not items:
+                raise Exception("No segments found in the playlist")
     
-            def download_worker():
-                while active_workers.is_set():
-                    try:
-                        try:
-                            i, segment_url, output_path = segment_queue.get(timeout=1)
-                        except queue.Empty:
-                            continue
-            
-                        try:
-                            if self.download_segment_with_retry(segment_url, output_path):
-                                results[i] = output_path
-                                current_completed = increment_counter()
-            
-                                progress = min(int((current_completed / total_segments) * 80), 79)
-                                self.progress_updated.emit(
-                                    self.url,
-                                    progress,
-                                    f"Downloading segments... {current_completed}/{total_segments} ({max_workers} threads)"
-                                )
-                            else:
-                                with counter_lock:
-                                    failed_segments.add(i)
-                                    download_errors.append(f"Segment {i}: Download cancelled")
-            
-                        except Exception as e:
-                            with counter_lock:
-                                failed_segments.add(i)
-                                download_errors.append(f"Segment {i}: {str(e)}")
-            
-                        finally:
-                            segment_queue.task_done()
+            # Combine segments as they arrive, so FFmpeg works through the
+            # stream while later segments are still downloading
+            ordered_segments = OrderedSegments(len(items))
+            total_duration = sum(segment.duration or 0 for segment in segments)
+            combine_result = {}
+            combiner = threading.Thread(
+                target=self._combine_worker,
+                args=(ordered_segments, os.path.join(self.save_path, "output"), total_duration, combine_result),
+                daemon=True
+            )
+            self.downloading = True
+            combiner.start()
             
-                    except Exception as e:
-                        logger.error(f"Worker thread error: {str(e)}")
-                        continue
-    
-            # Start worker threads
-            threads = []
-            for _ in range(max_workers):
-                thread = threading.Thread(target=download_worker)
-                thread.daemon = True
-                thread.start()
-                threads.append(thread)
-    
-            # Wait for downloads to complete
-            while active_workers.is_set():
-                total_processed = completed_segments + len(failed_segments)
-                if total_processed >= total_segments:
-                    break
+            try:
+                download_errors = run_coroutine(self._download_all(items, ordered_segments))
+                
                 if not self.is_running:
-                    active_workers.clear()
-                    break
-                time.sleep(0.5)
-    
-            # Clean shutdown
-            active_workers.clear()
-            for thread in threads:
-                thread.join(timeout=2)
-    
-            if not self.is_running:
-                raise Exception("Download cancelled by user")
+                    raise Exception("Download cancelled by user")
+        
+                if download_errors:
+                    raise Exception(f"Failed to download {len(download_errors)} segments:\n" + 
+                                  "\n".join(download_errors[:5]) +
+                                  (f"\n... and {len(download_errors) - 5} more errors" if len(download_errors) > 5 else ""))
+            except Exception:
+                ordered_segments.abort()
+                combiner.join()
+                # A failed combine stops the download; report its cause
+                if 'error' in combine_result:
+                    raise combine_result['error']
+                raise
+            finally:
+                self.downloading = False
     
-            if failed_segments:
-                raise Exception(f"Failed to download {len(failed_segments)} segments:\n" + 
-                              "\n".join(download_errors[:5]) +
-                              (f"\n... and {len(download_errors) - 5} more errors" if len(download_errors) > 5 else ""))
-    
-            # Get ordered list of segment files
-            segment_files = [results[i] for i in range(total_segments) if i not in failed_segments]
-    
-            if not segment_files:
-                raise Exception("No segments were downloaded successfully")
-    
-            # Combine segments
             self.progress_updated.emit(self.url, 80, "Combining segments...")
-            if not self.combine_segments(segment_files, os.path.join(self.save_path, "output")):
+            combiner.join()
+            if 'error' in combine_result:
+                raise combine_result['error']
+            if not combine_result.get('ok'):
                 raise Exception("Failed to combine segments")
     
             self.progress_updated.emit(self.url, 100, "Download complete!")
@@ -902,53 +1090,164 @@ class StreamDownloader(QThread):
             logger.error(f"Download error: {str(e)}")
             self.download_error.emit(self.url, str(e))
         finally:
+            # A cancelled or failed run can leave thousands of segments
+            # behind, so they are deleted without holding up this thread
             if self.temp_dir and os.path.exists(self.temp_dir):
+                threading.Thread(
+                    target=shutil.rmtree,
+                    args=(self.temp_dir,),
+                    kwargs={'ignore_errors': True},
+                    daemon=True
+                ).start()
+
+    async def _download_all(self, items, ordered_segments):
+        """Download all segments concurrently on a single event loop"""
+        total_segments = len(items)
+        max_workers = min(self.max_concurrent_segments, total_segments)
+        download_errors = []
+        completed_segments = 0
+        last_emit = 0.0
+        
+        sem = asyncio.Semaphore(max_workers)
+        
+        async with self._configure_async_session(max_workers) as session:
+            async def fetch(i, segment_url, output_path, byte_range):
+                nonlocal completed_segments, last_emit
                 try:
-                    shutil.rmtree(self.temp_dir, ignore_errors=True)
-                except:
-                    pass
+                    if await self.download_segment(session, sem, segment_url, output_path, byte_range):
+                        ordered_segments.put(i, output_path)
+                        completed_segments += 1
+                        
+                        # Cap progress signals at 10 per second; each one is
+                        # marshalled onto the GUI thread's event loop
+                        now = time.monotonic()
+                        if now - last_emit < 0.1 and completed_segments < total_segments:
+                            return
+                        last_emit = now
+                        
+                        progress = min(int((completed_segments / total_segments) * 80), 79)
+                        self.progress_updated.emit(
+                            self.url,
+                            progress,
+                            f"Downloading segments... {completed_segments}/{total_segments} ({max_workers} connections)"
+                        )
+                    else:
+                        download_errors.append(f"Segment {i}: Download cancelled")
+                except Exception as e:
+                    download_errors.append(f"Segment {i}: {str(e)}")
+            
+            await asyncio.gather(*(fetch(*item) for item in items))
+        
+        return download_errors
 
-    def download_segment_with_retry(self, url, output_path):
+    @contextlib.asynccontextmanager
+    async def _get_segment(self, session, url, byte_range=None, offset=0):
+        """Request a segment from offset on, yielding its status, headers and a chunk iterator"""
+        start = (byte_range[0] if byte_range else 0) + offset
+        end = byte_range[1] if byte_range else ''
+        headers = {'Range': f'bytes={start}-{end}'}
+            
+        is_httpx = httpx and isinstance(session, httpx.AsyncClient)
+        if is_httpx:
+            request = session.stream('GET', url, headers=headers)
+        else:
+            request = session.get(url, allow_redirects=True, headers=headers)
+            
+        async with request as response:
+            if is_httpx:
+                status, chunks = response.status_code, response.aiter_raw(self.chunk_size)
+            else:
+                status, chunks = response.status, response.content.iter_chunked(self.chunk_size)
+            
+            # Servers that ignore Range send the whole file
+            if byte_range and status == 200:
+                chunks = self._slice_chunks(chunks, (start, end))
+            yield status, response.headers, chunks
+    
+    @staticmethod
+    async def _slice_chunks(chunks, byte_range):
+        """Trim a full response body down to the requested byte range"""
+        skip = byte_range[0]
+        remaining = byte_range[1] - byte_range[0] + 1
+        async for chunk in chunks:
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            chunk = chunk[skip:skip + remaining]
+            skip = 0
+            remaining -= len(chunk)
+            yield chunk
+            if remaining <= 0:
+                return
+    
+    @staticmethod
+    def _partial_size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    
+    async def download_segment(self, session, sem, url, output_path, byte_range=None):
         """Enhanced segment download with better retry logic"""
-        domains = ['noltrixfire91.live', 'velloxfire.pro']
-        rate_limiter = RateLimiter(max_per_second=2)
+        # Only relative URIs fan out across the fallback hosts
+        if url.startswith('http'):
+            candidate_urls = [url]
+        else:
+            path = url.lstrip('/')
+            candidate_urls = [base + path for base in self.segment_domain_bases]
         
+        # Bytes from a failed attempt are kept and the rest is requested with
+        # a Range header, so a dropped connection doesn't restart the segment
+        temp_path = output_path + '.part'
+        retry_after = None
         for attempt in range(self.retry_count):
+            if not self.is_running:
+                return False
+            
+            # Back off with full jitter, honouring any Retry-After from the
+            # server; the connection slot is released while waiting
+            if attempt > 0:
+                delay = random.uniform(0, min(30, 0.5 * 2 ** attempt))
+                await asyncio.sleep(max(delay, retry_after or 0))
+                retry_after = None
+            
             try:
-                rate_limiter.wait()
-                
-                for domain in domains:
-                    current_url = url
-                    if not current_url.startswith('http'):
-                        parsed_base = urlparse(self.url)
-                        current_url = f"{parsed_base.scheme}://{domain}/{current_url.lstrip('/')}"
-                    
-                    if attempt > 0:
-                        time.sleep(1 * (2 ** (attempt - 1)))
-                    
-                    response = self.session.get(
-                        current_url,
-                        verify=False,
-                        timeout=30,
-                        stream=True,
-                        allow_redirects=True,
-                        headers={
-                            **self.session.headers,
-                            'Range': 'bytes=0-'
-                        }
-                    )
-                    
-                    if response.status_code in [200, 206]:
-                        with open(output_path, 'wb') as f:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                if not self.is_running:
-                                    return False
-                                if chunk:
-                                    f.write(chunk)
-                        return True
-                    
-                    logger.debug(f"Attempt {attempt + 1} failed for domain {domain}: {response.status_code}")
-                        
+                async with sem:
+                    for current_url in candidate_urls:
+                        # Every segment is queued on the semaphore up front, so
+                        # a stop has to be noticed here, before the request
+                        if not self.is_running:
+                            return False
+                        offset = self._partial_size(temp_path)
+                        async with self._get_segment(session, current_url, byte_range, offset) as (status, headers, chunks):
+                            if status in [200, 206]:
+                                # A full response to a resumed whole-file
+                                # request starts over from the first byte
+                                resumed = offset > 0 and (status == 206 or byte_range is not None)
+                                
+                                # Disk writes run in the default executor so
+                                # they don't stall other downloads on the loop
+                                f = await asyncio.to_thread(open, temp_path, 'ab' if resumed else 'wb')
+                                try:
+                                    async for chunk in chunks:
+                                        if not self.is_running:
+                                            return False
+                                        await asyncio.to_thread(f.write, chunk)
+                                finally:
+                                    await asyncio.to_thread(f.close)
+                                await asyncio.to_thread(os.replace, temp_path, output_path)
+                                return True
+                            
+                            if status == 416 and offset:
+                                # The kept bytes don't fit the resource any more
+                                await asyncio.to_thread(os.remove, temp_path)
+                            
+                            if status in (429, 503):
+                                value = headers.get('Retry-After', '')
+                                retry_after = min(float(value), 60) if value.isdigit() else None
+                            
+                            logger.debug(f"Attempt {attempt + 1} failed for {current_url}: {status}")
+                            
             except Exception as e:
                 logger.error(f"Download error on attempt {attempt + 1}: {str(e)}")
                 if attempt == self.retry_count - 1:
@@ -957,53 +1256,99 @@ class StreamDownloader(QThread):
                 
         raise Exception(f"Failed to download segment after {self.retry_count} attempts")
     
-    def combine_segments(self, segment_files, output_base):
+    def _report_combine(self, progress, status):
+        """Emit combine progress once downloading has finished"""
+        if not self.downloading:
+            self.progress_updated.emit(self.url, progress, status)
+    
+    def _combine_worker(self, segments, output_base, total_duration, result):
+        """Run combine_segments on its own thread, keeping the outcome for run()"""
+        try:
+            result['ok'] = self.combine_segments(segments, output_base, total_duration)
+        except Exception as e:
+            result['error'] = e
+            # Nothing will consume the remaining segments, so stop fetching them
+            self.is_running = False
+    
+    def _concat_segments(self, segments, output_file):
+        """Join segments byte-for-byte, copying in the kernel where supported"""
+        last_progress = -1
+        
+        with open(output_file, 'wb') as outfile:
+            for i, segment in enumerate(segments):
+                if not self.is_running:
+                    return False
+                append_file(segment, outfile)
+                os.remove(segment)
+                progress = int((i / segments.total) * 100)
+                if progress != last_progress:
+                    last_progress = progress
+                    self._report_combine(progress, f"Combining segments... {progress}%")
+        
+        return not segments.aborted
+    
+    def _feed_segments(self, segments, pipe):
+        """Write segments into FFmpeg's stdin in playlist order"""
+        try:
+            for segment in segments:
+                if not self.is_running:
+                    break
+                append_file(segment, pipe)
+                os.remove(segment)
+        except OSError as e:
+            # FFmpeg went away early; its exit code carries the real error
+            logger.debug(f"Stopped feeding segments to FFmpeg: {str(e)}")
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _remove_partial_output(output_file):
+        try:
+            if os.path.exists(output_file):
+                os.remove(output_file)
+        except OSError:
+            pass
+    
+    def combine_segments(self, segments, output_base, total_duration=None):
+        output_file = None
         try:
             if not shutil.which('ffmpeg'):
                 raise Exception("FFmpeg not found. Please install FFmpeg to continue.")
     
             output_format = self.settings.get('output_format', 'mp4')
             quality = self.settings.get('quality', 'Super Duper!')
-            temp_file = os.path.join(self.temp_dir, f"temp_fixed.ts")
             output_file = self.get_unique_filename(output_base, output_format)
-    
-            # STEP 1: Combine segments
-            self.progress_updated.emit(self.url, 0, "Combining segments...")
             
-            with open(temp_file, 'wb', buffering=64*1024) as outfile:
-                for i, segment in enumerate(segment_files):
-                    if not self.is_running:
-                        return False
-                    with open(segment, 'rb') as infile:
-                        shutil.copyfileobj(infile, outfile, length=64*1024)
-                    progress = int((i / len(segment_files)) * 100)
-                    self.progress_updated.emit(self.url, progress, f"Combining segments... {progress}%")
+            # TS segments can simply be joined back to back when the source
+            # stream is kept as-is, so FFmpeg isn't needed at all
+            if output_format == 'ts' and self.settings.get('preserve_source', True):
+                self._report_combine(0, "Combining segments...")
+                if not self._concat_segments(segments, output_file):
+                    self._remove_partial_output(output_file)
+                    return False
+                self._report_combine(100, "Processing complete!")
+                return True
     
-            self.progress_updated.emit(self.url, 100, "Analyzing video...")
+            # Wait for the first segment before looking at the streams
+            first_segment = segments.get(0)
+            if first_segment is None:
+                self._remove_partial_output(output_file)
+                return False
     
-            # STEP 2: Get total frame count
-            frame_count_cmd = [
-                'ffprobe',
-                '-v', 'error',
-                '-select_streams', 'v:0',
-                '-count_packets',
-                '-show_entries', 'stream=nb_read_packets',
-                '-of', 'csv=p=0',
-                temp_file
-            ]
-            
-            try:
-                total_frames = int(subprocess.check_output(frame_count_cmd).decode().strip())
-            except:
-                total_frames = None
+            self._report_combine(100, "Analyzing video...")
     
-            # STEP 3: Analyze streams
+            # STEP 1: Analyze streams; every segment carries the same
+            # streams, so probing the first one is enough
             probe_cmd = [
                 'ffprobe',
                 '-v', 'quiet',
                 '-print_format', 'json',
                 '-show_streams',
-                temp_file
+                '-show_format',
+                first_segment
             ]
             
             probe_result = subprocess.run(
@@ -1017,12 +1362,15 @@ class StreamDownloader(QThread):
                 
             streams_info = json.loads(probe_result.stdout)
             
-            # Initialize FFmpeg command
-            cmd = ['ffmpeg', '-y']
-    
-            # Input options
-            cmd.extend(['-i', temp_file])
-    
+            # STEP 2: Estimate total duration from the first segment when the
+            # playlist didn't provide segment durations
+            if not total_duration:
+                try:
+                    segment_duration = float(streams_info.get('format', {}).get('duration', 0))
+                    total_duration = segment_duration * segments.total or None
+                except ValueError:
+                    total_duration = None
+            
             # Stream mapping
             video_streams = []
             audio_streams = []
@@ -1035,6 +1383,36 @@ class StreamDownloader(QThread):
                     audio_streams.append(stream)
                 elif stream['codec_type'] == 'subtitle':
                     subtitle_streams.append(stream)
+            
+            # Remux without decoding when the source codecs already fit the
+            # output container and the user wants the source quality kept
+            copy_video, copy_audio = COPY_COMPATIBLE_CODECS.get(output_format, (set(), set()))
+            audio_copy = {s.get('codec_name') for s in audio_streams} <= copy_audio
+            stream_copy = (
+                self.settings.get('preserve_source', True)
+                and {s.get('codec_name') for s in video_streams} <= copy_video
+                and audio_copy
+            )
+            
+            hw_encoder = None
+            if not stream_copy and self.settings.get('hardware_encoding', False):
+                hw_encoder = detect_hardware_encoder()
+    
+            # Initialize FFmpeg command
+            cmd = ['ffmpeg', '-y']
+    
+            # Input options; segments are streamed in over stdin so
+            # timestamps stay continuous, as in a plain TS concatenation
+            if stream_copy:
+                cmd.extend(['-fflags', '+genpts'])
+            elif hw_encoder:
+                cmd.extend(HARDWARE_ENCODERS[hw_encoder][0])
+            # Use the demuxer ffprobe picked for the first segment so packed
+            # audio and fMP4 segments aren't forced through the TS demuxer
+            input_format = streams_info.get('format', {}).get('format_name', '').split(',')[0]
+            if input_format:
+                cmd.extend(['-f', input_format])
+            cmd.extend(['-i', 'pipe:0'])
     
             # Map all streams
             for i, stream in enumerate(video_streams):
@@ -1045,7 +1423,11 @@ class StreamDownloader(QThread):
                 cmd.extend(['-map', f'0:{stream["index"]}'])
     
             # Set codecs based on quality settings
-            if quality == 'Super Duper!':
+            if stream_copy:
+                cmd.extend(['-c:v', 'copy'])
+            elif hw_encoder:
+                cmd.extend(hardware_encoder_args(hw_encoder, quality))
+            elif quality == 'Super Duper!':
                 cmd.extend([
                     '-c:v', 'libx264',
                     '-preset', 'veryfast',
@@ -1064,11 +1446,17 @@ class StreamDownloader(QThread):
                     '-crf', '23'
                 ])
     
-            # Audio and subtitle settings remain the same
-            cmd.extend([
-                '-c:a', 'aac',
-                '-b:a', '128k'
-            ])
+            # Audio the container already accepts is copied even when the
+            # video gets re-encoded; re-encoding AAC to AAC only costs CPU
+            if audio_copy:
+                cmd.extend(['-c:a', 'copy'])
+                if output_format == 'mp4' and all(s.get('codec_name') == 'aac' for s in audio_streams):
+                    cmd.extend(['-bsf:a', 'aac_adtstoasc'])
+            else:
+                cmd.extend([
+                    '-c:a', 'aac',
+                    '-b:a', '128k'
+                ])
     
             if subtitle_streams:
                 cmd.extend(['-c:s', 'copy'])
@@ -1088,95 +1476,112 @@ class StreamDownloader(QThread):
                     f'-metadata:s:s:{i}', f'title=Subtitle Track {i+1}'
                 ])
     
-            # Output options
+            # Output options; progress is reported as key=value lines on stdout
             cmd.extend([
                 '-movflags', '+faststart',
+                '-v', 'error',
+                '-nostats',
+                '-progress', 'pipe:1',
                 output_file
             ])
     
             process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1
+                stderr=subprocess.PIPE
             )
+            
+            # Drain stderr as it arrives so a flood of decode errors can't
+            # fill the pipe and stall FFmpeg; only the tail is kept
+            error_tail = deque(maxlen=50)
+            stderr_reader = threading.Thread(
+                target=error_tail.extend,
+                args=(process.stderr,),
+                daemon=True
+            )
+            stderr_reader.start()
+            
+            feeder = threading.Thread(
+                target=self._feed_segments,
+                args=(segments, process.stdin),
+                daemon=True
+            )
+            feeder.start()
     
-            last_frame = None
-            last_fps = None
-            start_time = time.time()
-            last_update = time.time()
+            progress_info = {}
     
             while True:
                 if not self.is_running:
                     process.terminate()
+                    process.wait()
+                    self._remove_partial_output(output_file)
                     return False
     
-                retcode = process.poll()
-                if retcode is not None:
-                    if retcode != 0:
-                        _, stderr = process.communicate()
-                        raise Exception(f"FFmpeg error: {stderr}")
+                line = process.stdout.readline()
+                if not line:
                     break
     
-                # Update progress info every 0.5 seconds
-                if time.time() - last_update >= 0.5:
-                    stderr_line = process.stderr.readline()
-                    if 'frame=' in stderr_line:
-                        try:
-                            # Extract frame number and FPS
-                            frame_match = re.search(r'frame=\s*(\d+)', stderr_line)
-                            fps_match = re.search(r'fps=\s*(\d+)', stderr_line)
-                            speed_match = re.search(r'speed=\s*(\d+.\d+)x', stderr_line)
-                            
-                            if frame_match:
-                                current_frame = int(frame_match.group(1))
-                                current_fps = int(fps_match.group(1)) if fps_match else 0
-                                current_speed = float(speed_match.group(1)) if speed_match else 0
-                                
-                                status = f"Processing video... "
-                                if total_frames:
-                                    progress_percent = min(100, int((current_frame / total_frames) * 100))
-                                    status += f"Frame {current_frame}/{total_frames} ({progress_percent}%)"
-                                else:
-                                    status += f"Frame {current_frame}"
-                                    
-                                if current_fps > 0:
-                                    status += f" ({current_fps} fps"
-                                    if current_speed > 0:
-                                        status += f", {current_speed:.1f}x"
-                                    status += ")"
-                                
-                                self.progress_updated.emit(self.url, 100, status)
-                                
-                        except Exception as e:
-                            pass
-                            
-                    last_update = time.time()
+                # Each progress block ends with a progress=continue/end line
+                key, _, value = line.decode(errors='replace').strip().partition('=')
+                progress_info[key] = value
+                if key != 'progress':
+                    continue
+    
+                try:
+                    current_frame = int(progress_info.get('frame', 0))
+                    current_fps = float(progress_info.get('fps', 0))
+                    out_time = int(progress_info.get('out_time_us', 0)) / 1_000_000
+                except ValueError:
+                    continue
+                speed = progress_info.get('speed', '').rstrip('x')
+                current_speed = float(speed) if speed.replace('.', '', 1).isdigit() else 0
+                
+                status = f"Processing video... Frame {current_frame}"
+                if total_duration:
+                    progress_percent = min(100, int((out_time / total_duration) * 100))
+                    status += f" ({progress_percent}%)"
+                    
+                if current_fps > 0:
+                    status += f" ({current_fps:.0f} fps"
+                    if current_speed > 0:
+                        status += f", {current_speed:.1f}x"
+                    status += ")"
+                
+                self._report_combine(100, status)
+    
+            feeder.join()
+            returncode = process.wait()
     
-                time.sleep(0.1)
+            if segments.aborted or not self.is_running:
+                self._remove_partial_output(output_file)
+                return False
+    
+            if returncode != 0:
+                stderr_reader.join()
+                stderr = b''.join(error_tail).decode(errors='replace')
+                raise Exception(f"FFmpeg error: {stderr}")
     
             # Verify output
             if not os.path.exists(output_file) or os.path.getsize(output_file) < 1000:
                 raise Exception("Output file is invalid")
     
-            self.progress_updated.emit(self.url, 100, "Processing complete!")
+            self._report_combine(100, "Processing complete!")
             return True
     
         except Exception as e:
             logger.error(f"Error combining segments: {str(e)}")
+            # The name is reserved up front, so don't leave it behind
+            if output_file:
+                self._remove_partial_output(output_file)
             raise
-        finally:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except:
-                pass
 
 class SettingsTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.original_settings = {}
+        self.settings_mtime = None
+        self.settings_cache = None
         self.init_ui()
         self.load_settings()  # Load initial settings
         self.save_original_settings()  # Save initial state
@@ -1211,6 +1616,11 @@ class SettingsTab(QWidget):
         video_layout.addWidget(QLabel("Quality Preset:"), 2, 0)
         video_layout.addWidget(self.preset_combo, 2, 1)
         
+        self.hw_encoding_check = QCheckBox("Use Hardware Encoding When Available")
+        self.hw_encoding_check.setChecked(False)
+        self.hw_encoding_check.setToolTip("NVENC, Quick Sync or VideoToolbox, when the video has to be re-encoded")
+        video_layout.addWidget(self.hw_encoding_check, 3, 0, 1, 2)
+        
         video_group.setLayout(video_layout)
         layout.addWidget(video_group)
 
@@ -1240,6 +1650,18 @@ class SettingsTab(QWidget):
         self.concurrent_check.setChecked(False)
         download_layout.addWidget(self.concurrent_check, 3, 0, 1, 2)
         
+        self.http2_check = QCheckBox("Use HTTP/2 When Available")
+        self.http2_check.setChecked(False)
+        self.http2_check.setToolTip("Requires the httpx and h2 packages")
+        download_layout.addWidget(self.http2_check, 4, 0, 1, 2)
+        
+        self.max_concurrent_spin = QSpinBox()
+        self.max_concurrent_spin.setRange(1, 10)
+        self.max_concurrent_spin.setValue(3)
+        self.max_concurrent_spin.setToolTip("Only used when downloading streams concurrently")
+        download_layout.addWidget(QLabel("Max Concurrent Downloads:"), 5, 0)
+        download_layout.addWidget(self.max_concurrent_spin, 5, 1)
+        
         download_group.setLayout(download_layout)
         layout.addWidget(download_group)
 
@@ -1267,6 +1689,16 @@ class SettingsTab(QWidget):
         button_layout.addWidget(self.apply_btn)
         layout.addLayout(button_layout)
 
+        # Downloads read the settings on every start, finish and error, so
+        # the dict is only rebuilt after one of the widgets has changed
+        for combo in (self.quality_combo, self.format_combo, self.preset_combo):
+            combo.currentTextChanged.connect(self.invalidate_settings)
+        for spin in (self.thread_spin, self.timeout_spin, self.retry_spin, self.max_concurrent_spin):
+            spin.valueChanged.connect(self.invalidate_settings)
+        for check in (self.concurrent_check, self.http2_check, self.auto_rename_check,
+                      self.preserve_source_check, self.hw_encoding_check):
+            check.toggled.connect(self.invalidate_settings)
+
         # Put the container in the scroll area
         scroll.setWidget(container)
         
@@ -1309,7 +1741,15 @@ class SettingsTab(QWidget):
             QMessageBox.Ok
         )
 
+    def invalidate_settings(self, *args):
+        self.settings_cache = None
+
     def get_settings(self):
+        if self.settings_cache is None:
+            self.settings_cache = self._read_settings()
+        return dict(self.settings_cache)
+
+    def _read_settings(self):
         return {
             'quality': self.quality_combo.currentText(),
             'output_format': self.format_combo.currentText(),
@@ -1317,16 +1757,22 @@ class SettingsTab(QWidget):
             'segment_timeout': self.timeout_spin.value(),
             'retry_attempts': self.retry_spin.value(),
             'concurrent_downloads': self.concurrent_check.isChecked(),
+            'max_concurrent_downloads': self.max_concurrent_spin.value(),
+            'use_http2': self.http2_check.isChecked(),
             'auto_rename': self.auto_rename_check.isChecked(),
             'preserve_source': self.preserve_source_check.isChecked(),
+            'hardware_encoding': self.hw_encoding_check.isChecked(),
             'preset': self.preset_combo.currentText()
         }
 
     def save_settings(self):
         settings = self.get_settings()
         try:
-            with open('Settings/m3u8_settings.json', 'w') as f:
-                json.dump(settings, f)
+            data = orjson.dumps(settings) if orjson else json.dumps(settings).encode()
+            with open('Settings/m3u8_settings.json', 'wb') as f:
+                f.write(data)
+            # The widgets already hold what was just written
+            self.settings_mtime = os.stat('Settings/m3u8_settings.json').st_mtime_ns
         except Exception as e:
             logger.error(f"Error saving settings: {str(e)}")
             QMessageBox.critical(
@@ -1338,8 +1784,15 @@ class SettingsTab(QWidget):
 
     def load_settings(self):
         try:
-            with open('Settings/m3u8_settings.json', 'r') as f:
-                settings = json.load(f)
+            # Skip re-reading a file that hasn't changed since the last load
+            mtime = os.stat('Settings/m3u8_settings.json').st_mtime_ns
+            if mtime == self.settings_mtime:
+                return
+            
+            with open('Settings/m3u8_settings.json', 'rb') as f:
+                data = f.read()
+            settings = orjson.loads(data) if orjson else json.loads(data)
+            self.settings_mtime = mtime
                 
             self.quality_combo.setCurrentText(settings.get('quality', 'Super Duper!'))
             self.format_combo.setCurrentText(settings.get('output_format', 'mp4'))
@@ -1347,8 +1800,11 @@ class SettingsTab(QWidget):
             self.timeout_spin.setValue(settings.get('segment_timeout', 30))
             self.retry_spin.setValue(settings.get('retry_attempts', 3))
             self.concurrent_check.setChecked(settings.get('concurrent_downloads', False))
+            self.max_concurrent_spin.setValue(settings.get('max_concurrent_downloads', 3))
+            self.http2_check.setChecked(settings.get('use_http2', False))
             self.auto_rename_check.setChecked(settings.get('auto_rename', True))
             self.preserve_source_check.setChecked(settings.get('preserve_source', True))
+            self.hw_encoding_check.setChecked(settings.get('hardware_encoding', False))
             self.preset_combo.setCurrentText(settings.get('preset', 'Standard'))
         except:
             # If settings file doesn't exist or is invalid, use defaults
@@ -1362,8 +1818,18 @@ class M3U8StreamDownloader(QMainWindow):
         self.setWindowTitle("M3U8 Stream Downloader")
         self.setMinimumSize(900, 700)
         self.active_downloads = {}
+        self.status_counts = Counter()
+        self.waiting_queue = deque()
         self.save_path = None
         
+        # Progress signals are coalesced per URL and applied at most every
+        # 50ms, so several busy workers can't flood the event loop
+        self.pending_updates = {}
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setSingleShot(True)
+        self.progress_timer.setInterval(50)
+        self.progress_timer.timeout.connect(self.flush_progress)
+        
         # Create UI elements
         self.url_input = QLineEdit()
         self.downloads_area = QScrollArea()
@@ -1520,6 +1986,23 @@ class M3U8StreamDownloader(QMainWindow):
             )
             return
 
+        self._create_download(url)
+        self.start_all_btn.setEnabled(True)
+        self.update_status_bar()
+
+    def add_downloads(self, urls):
+        """Queue several new URLs with a single relayout and status update"""
+        self.downloads_widget.setUpdatesEnabled(False)
+        try:
+            for url in urls:
+                self._create_download(url)
+        finally:
+            self.downloads_widget.setUpdatesEnabled(True)
+
+        self.start_all_btn.setEnabled(True)
+        self.update_status_bar()
+
+    def _create_download(self, url):
         download_widget = DownloadWidget(url)
         download_widget.cancel_btn.clicked.connect(lambda: self.remove_download(url))
         
@@ -1533,16 +2016,15 @@ class M3U8StreamDownloader(QMainWindow):
             'worker': None,
             'status': 'waiting'
         }
-
-        self.start_all_btn.setEnabled(True)
-        self.update_status_bar()
+        self.status_counts['waiting'] += 1
+        self.waiting_queue.append(url)
 
     def add_url_from_input(self):
         url = self.url_input.text().strip()
         if not url:
             return
             
-        if not (url.startswith('http') or url.startswith('#EXTM3U')):
+        if not url.startswith(('http', '#EXTM3U')):
             QMessageBox.warning(
                 self,
                 "Invalid URL",
@@ -1576,35 +2058,35 @@ class M3U8StreamDownloader(QMainWindow):
             if not self.save_path:
                 return
 
-        added = 0
+        # Collect everything first so the widgets are added in one batch
+        new_urls = []
+        seen = set(self.active_downloads)
         skipped = 0
         errors = 0
         
         for file_path in file_paths:
             try:
-                if file_path.endswith('.txt'):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            url = line.strip()
-                            if url and (url.startswith('http') or url.startswith('#EXTM3U')):
-                                if url not in self.active_downloads:
-                                    self.add_download(url)
-                                    added += 1
-                                else:
-                                    skipped += 1
-                else:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read().strip()
-                        if content not in self.active_downloads:
-                            self.add_download(content)
-                            added += 1
-                        else:
-                            skipped += 1
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    if file_path.endswith('.txt'):
+                        urls = [url for url in map(str.strip, f) if url.startswith(('http', '#EXTM3U'))]
+                    else:
+                        urls = [f.read().strip()]
+                        
+                for url in urls:
+                    if url in seen:
+                        skipped += 1
+                    else:
+                        seen.add(url)
+                        new_urls.append(url)
                             
             except Exception as e:
                 logger.error(f"Error reading file {file_path}: {str(e)}")
                 errors += 1
 
+        added = len(new_urls)
+        if new_urls:
+            self.add_downloads(new_urls)
+
         message = f"Added {added} new downloads\n"
         if skipped > 0:
             message += f"Skipped {skipped} duplicate URLs\n"
@@ -1635,18 +2117,10 @@ class M3U8StreamDownloader(QMainWindow):
             if not self.save_path:
                 return
 
-        settings = self.settings_tab.get_settings()
-        concurrent = settings['concurrent_downloads']
-
         self.start_all_btn.setEnabled(False)
         self.stop_all_btn.setEnabled(True)
 
-        if concurrent:
-            for url in list(self.active_downloads.keys()):
-                if self.active_downloads[url]['status'] == 'waiting':
-                    self.start_download(url)
-        else:
-            self.start_next_download()
+        self.start_next_download()
 
     def stop_all_downloads(self):
         active_count = 0
@@ -1654,7 +2128,7 @@ class M3U8StreamDownloader(QMainWindow):
             if download['status'] == 'downloading':
                 if download['worker']:
                     download['worker'].stop()
-                download['status'] = 'stopped'
+                self._set_status(download, 'stopped')
                 download['widget'].update_status("Stopped", "#ff5252")
                 active_count += 1
 
@@ -1671,8 +2145,7 @@ class M3U8StreamDownloader(QMainWindow):
         self.update_status_bar()
 
     def clear_completed_downloads(self):
-        completed_count = sum(1 for d in self.active_downloads.values() 
-                            if d['status'] in ['completed', 'error', 'stopped'])
+        completed_count = sum(self.status_counts[s] for s in ['completed', 'error', 'stopped'])
         
         if completed_count == 0:
             return
@@ -1691,8 +2164,14 @@ class M3U8StreamDownloader(QMainWindow):
                 if download['status'] in ['completed', 'error', 'stopped']
             ]
             
-            for url in urls_to_remove:
-                self.remove_download(url)
+            # Drop all the rows in one go and refresh the window once
+            self.downloads_widget.setUpdatesEnabled(False)
+            try:
+                for url in urls_to_remove:
+                    self._remove_download(url)
+            finally:
+                self.downloads_widget.setUpdatesEnabled(True)
+            self._downloads_removed()
             
             QMessageBox.information(
                 self,
@@ -1717,12 +2196,23 @@ class M3U8StreamDownloader(QMainWindow):
             if reply == QMessageBox.No:
                 return
 
+        freed_slot = download['status'] == 'downloading'
+        self._remove_download(url)
+        self._downloads_removed()
+        
+        # Hand the cancelled download's slot to the next queued URL
+        if freed_slot:
+            self.start_next_download()
+
+    def _remove_download(self, url):
+        download = self.active_downloads.pop(url)
         if download['worker']:
             download['worker'].stop()
             
         download['widget'].deleteLater()
-        del self.active_downloads[url]
+        self.status_counts[download['status']] -= 1
 
+    def _downloads_removed(self):
         if not self.active_downloads:
             self.start_all_btn.setEnabled(False)
             self.stop_all_btn.setEnabled(False)
@@ -1740,9 +2230,8 @@ class M3U8StreamDownloader(QMainWindow):
         worker.download_complete.connect(self.download_finished)
         worker.download_error.connect(self.download_error)
         
-        self.active_downloads[url].update({
-            'worker': worker,
-            'status': 'downloading'})
+        self.active_downloads[url]['worker'] = worker
+        self._set_status(self.active_downloads[url], 'downloading')
         
         self.active_downloads[url]['widget'].update_status(
             "Initializing download...",
@@ -1754,78 +2243,65 @@ class M3U8StreamDownloader(QMainWindow):
         self.update_status_bar()
 
     def start_next_download(self):
-        for url in self.active_downloads:
-            if self.active_downloads[url]['status'] == 'waiting':
+        """Start waiting downloads until the concurrency limit is reached"""
+        settings = self.settings_tab.get_settings()
+        limit = settings['max_concurrent_downloads'] if settings['concurrent_downloads'] else 1
+        
+        # Removed downloads are left in the queue and skipped here
+        while self.waiting_queue and self.status_counts['downloading'] < limit:
+            url = self.waiting_queue.popleft()
+            download = self.active_downloads.get(url)
+            if download and download['status'] == 'waiting':
                 self.start_download(url)
-                break
 
     def update_progress(self, url, progress, status):
-        if url not in self.active_downloads:
-            return
-
-        download = self.active_downloads[url]
+        self.pending_updates[url] = (progress, status)
+        if not self.progress_timer.isActive():
+            self.progress_timer.start()
+
+    def flush_progress(self):
+        updates, self.pending_updates = self.pending_updates, {}
+        for url, (progress, status) in updates.items():
+            # Updates queued before a download finished or failed are stale
+            download = self.active_downloads.get(url)
+            if download and download['status'] == 'downloading':
+                self._apply_progress(download, progress, status)
+
+    def _apply_progress(self, download, progress, status):
         download['widget'].progress_bar.setValue(progress)
         download['widget'].update_status(status)
         
         if progress < 30:
-            color = "#ff5252"
+            state = 'red'
         elif progress < 70:
-            color = "#ffd740"
+            state = 'amber'
         else:
-            color = "#69f0ae"
+            state = 'green'
             
-        download['widget'].progress_bar.setStyleSheet(
-            f"""
-            QProgressBar::chunk {{
-                background-color: {color};
-                border-radius: 2px;
-            }}
-            """
-        )
-
-        self.update_status_bar()
+        download['widget'].set_progress_state(state)
 
     def download_finished(self, url):
         if url not in self.active_downloads:
             return
 
         download = self.active_downloads[url]
-        download['status'] = 'completed'
+        self._set_status(download, 'completed')
         download['widget'].update_status("Completed", "#69f0ae")
         download['widget'].progress_bar.setValue(100)
-        download['widget'].progress_bar.setStyleSheet(
-            """
-            QProgressBar::chunk {
-                background-color: #69f0ae;
-                border-radius: 2px;
-            }
-            """
-        )
+        download['widget'].set_progress_state('green')
         
-        settings = self.settings_tab.get_settings()
-        if not settings['concurrent_downloads']:
-            self.start_next_download()
+        self.start_next_download()
 
-        active_downloads = any(
-            download['status'] == 'downloading' 
-            for download in self.active_downloads.values()
-        )
-        
-        if not active_downloads:
+        if not self.status_counts['downloading']:
             self.start_all_btn.setEnabled(True)
             self.stop_all_btn.setEnabled(False)
             
-            total_completed = sum(
-                1 for d in self.active_downloads.values() 
-                if d['status'] == 'completed'
-            )
+            total_completed = self.status_counts['completed']
             
             if total_completed > 0:
-                QMessageBox.information(
-                    self,
+                self.notify(
                     "Downloads Complete",
-                    f"All downloads completed successfully! ({total_completed} files)",
-                    QMessageBox.Ok
+                    f"All downloads completed successfully! ({total_completed} files)"
                 )
             
         self.update_status_bar()
@@ -1835,30 +2311,49 @@ class M3U8StreamDownloader(QMainWindow):
             return
 
         download = self.active_downloads[url]
-        download['status'] = 'error'
+        # A stopped worker still reports its cancellation; keep it stopped
+        # and don't let Stop All kick off the next queued downloads
+        if download['status'] == 'stopped':
+            return
+        
+        self._set_status(download, 'error')
         download['widget'].update_status("Error", "#ff5252")
         
         detailed_error = f"Error downloading {url}:\n\n{error}"
         logger.error(detailed_error)
         
-        QMessageBox.critical(
-            self,
+        # The full message stays on the row for when the notification is gone
+        download['widget'].status_label.setToolTip(detailed_error)
+        self.notify(
             "Download Error",
-            detailed_error,
-            QMessageBox.Ok
+            f"{download['widget'].url_label.text()}\n{error}",
+            QSystemTrayIcon.Critical
         )
 
-        settings = self.settings_tab.get_settings()
-        if not settings['concurrent_downloads']:
-            self.start_next_download()
+        self.start_next_download()
                 
         self.update_status_bar()
 
+    def notify(self, title, message, icon=QSystemTrayIcon.Information):
+        """Report through a tray notification, which unlike a dialog doesn't block"""
+        if self.tray_icon.isVisible() and QSystemTrayIcon.supportsMessages():
+            self.tray_icon.showMessage(title, message, icon, 4000)
+        elif icon == QSystemTrayIcon.Critical:
+            QMessageBox.critical(self, title, message, QMessageBox.Ok)
+        else:
+            QMessageBox.information(self, title, message, QMessageBox.Ok)
+
+    def _set_status(self, download, status):
+        """Change a download's status, keeping the status counts in step"""
+        self.status_counts[download['status']] -= 1
+        self.status_counts[status] += 1
+        download['status'] = status
+
     def update_status_bar(self):
         total = len(self.active_downloads)
-        active = sum(1 for d in self.active_downloads.values() if d['status'] == 'downloading')
-        completed = sum(1 for d in self.active_downloads.values() if d['status'] == 'completed')
-        errors = sum(1 for d in self.active_downloads.values() if d['status'] == 'error')
+        active = self.status_counts['downloading']
+        completed = self.status_counts['completed']
+        errors = self.status_counts['error']
         
         self.status_downloads.setText(f"Downloads: {total}")
         self.status_active.setText(f"Active: {active}")
@@ -1925,7 +2420,8 @@ class M3U8StreamDownloader(QMainWindow):
                     )
 
     def check_ffmpeg(self):
-        if not shutil.which('ffmpeg'):
+        ffmpeg_path = shutil.which('ffmpeg')
+        if not ffmpeg_path:
             QMessageBox.critical(
                 self,
                 "FFmpeg Not Found",
@@ -1935,6 +2431,14 @@ class M3U8StreamDownloader(QMainWindow):
             sys.exit(1)
         
         try:
+            # Only run the binary again when it has been replaced since the
+            # last successful check
+            settings = QSettings('M3U8ME', 'M3U8StreamDownloader')
+            cache_key = f"{ffmpeg_path}:{os.path.getmtime(ffmpeg_path)}"
+            if settings.value('ffmpeg_checked') == cache_key:
+                logger.info(f"FFmpeg found: {settings.value('ffmpeg_version')}")
+                return
+            
             result = subprocess.run(
                 ['ffmpeg', '-version'],
                 capture_output=True,
@@ -1945,6 +2449,8 @@ class M3U8StreamDownloader(QMainWindow):
                 
             version_line = result.stdout.split('\n')[0]
             logger.info(f"FFmpeg found: {version_line}")
+            settings.setValue('ffmpeg_checked', cache_key)
+            settings.setValue('ffmpeg_version', version_line)
         except Exception as e:
             QMessageBox.warning(
                 self,
@@ -1959,13 +2465,30 @@ class M3U8StreamDownloader(QMainWindow):
     def save_settings(self):
         self.settings_tab.save_settings()
 
+def encode_arguments(args):
+    """Length-prefix each argument so paths with spaces survive the socket"""
+    encoded = (arg.encode() for arg in args)
+    return b''.join(struct.pack('<I', len(arg)) + arg for arg in encoded)
+
+def decode_arguments(data):
+    args = []
+    offset = 0
+    while offset + 4 <= len(data):
+        (length,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        args.append(data[offset:offset + length].decode())
+        offset += length
+    return args
+
 def handle_new_instance(server, window):
     socket = server.nextPendingConnection()
     if socket.waitForReadyRead(1000):
-        data = socket.readAll().data().decode()
+        # Larger argument lists can arrive in more than one read
+        data = socket.readAll().data()
+        while socket.waitForReadyRead(100):
+            data += socket.readAll().data()
         if data:
-            args = data.split()
-            window.process_arguments(args)
+            window.process_arguments(decode_arguments(data))
         window.show()
         window.activateWindow()
 
@@ -1977,11 +2500,14 @@ def main():
     
     app = QApplication(sys.argv)
     
+    # Only needed for the single-instance check, so load it here
+    from PyQt5.QtNetwork import QLocalSocket, QLocalServer
+    
     socket = QLocalSocket()
     socket.connectToServer('M3U8ME-SingleInstance')
     
     if socket.waitForConnected(500):
-        socket.write(' '.join(sys.argv[1:]).encode())
+        socket.write(encode_arguments(sys.argv[1:]))
         socket.waitForBytesWritten()
         sys.exit(0)
     else:
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# m3u8me opens Logs/m3u8me.log under the working directory on import
+os.chdir(tempfile.mkdtemp())
+os.mkdir('Logs')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
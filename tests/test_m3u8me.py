@@ -0,0 +1,90 @@
+import asyncio
+import contextlib
+import subprocess
+import threading
+
+import m3u8me
+
+
+class FakeResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self):
+        self.content = self
+
+    async def iter_chunked(self, size):
+        await asyncio.sleep(0.02)
+        yield b'\x00' * 188
+
+
+class FakeSession:
+    def __init__(self):
+        self.requests = 0
+
+    @contextlib.asynccontextmanager
+    async def get(self, url, **kwargs):
+        self.requests += 1
+        yield FakeResponse()
+
+
+def test_combiner_failure_stops_segment_requests(tmp_path):
+    downloader = m3u8me.StreamDownloader(
+        'https://example.com/stream.m3u8', str(tmp_path), {'max_workers': 2, 'retry_attempts': 1}
+    )
+    session = FakeSession()
+
+    @contextlib.asynccontextmanager
+    async def fake_session(max_workers):
+        yield session
+    downloader._configure_async_session = fake_session
+
+    def failing_combine(segments, output_base, total_duration=None):
+        segments.get(0)
+        raise Exception("Failed to analyze media streams")
+    downloader.combine_segments = failing_combine
+
+    total = 50
+    items = [
+        (i, f'https://example.com/seg{i}.ts', str(tmp_path / f'segment_{i}.ts'), None)
+        for i in range(total)
+    ]
+    ordered_segments = m3u8me.OrderedSegments(total)
+    result = {}
+    combiner = threading.Thread(
+        target=downloader._combine_worker,
+        args=(ordered_segments, str(tmp_path / 'output'), None, result)
+    )
+    combiner.start()
+    m3u8me.run_coroutine(downloader._download_all(items, ordered_segments))
+    combiner.join()
+
+    assert 'error' in result
+    assert not downloader.is_running
+    assert session.requests < 10
+
+
+def test_hardware_encoder_args():
+    assert m3u8me.hardware_encoder_args('h264_nvenc', 'Super Duper!') == ['-c:v', 'h264_nvenc', '-cq', '18']
+    assert m3u8me.hardware_encoder_args('h264_qsv', 'Ehh...') == ['-c:v', 'h264_qsv', '-global_quality', '23']
+    # VideoToolbox's quality scale is inverted and runs up to 100
+    assert m3u8me.hardware_encoder_args('h264_videotoolbox', 'Super Duper!') == ['-c:v', 'h264_videotoolbox', '-q:v', '64']
+    assert m3u8me.hardware_encoder_args('h264_videotoolbox', 'WTF!!?') == ['-c:v', 'h264_videotoolbox', '-q:v', '44']
+
+
+def test_detect_hardware_encoder_skips_unusable_devices(monkeypatch):
+    probed = []
+
+    def fake_run(cmd, **kwargs):
+        encoder = cmd[cmd.index('-c:v') + 1]
+        probed.append(encoder)
+        return subprocess.CompletedProcess(cmd, 0 if encoder == 'h264_qsv' else 1)
+
+    monkeypatch.setattr(m3u8me.subprocess, 'run', fake_run)
+    m3u8me.detect_hardware_encoder.cache_clear()
+    try:
+        assert m3u8me.detect_hardware_encoder() == 'h264_qsv'
+        assert m3u8me.detect_hardware_encoder() == 'h264_qsv'
+        assert probed == ['h264_nvenc', 'h264_qsv']
+    finally:
+        m3u8me.detect_hardware_encoder.cache_clear()